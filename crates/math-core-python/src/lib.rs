@@ -1,6 +1,7 @@
-use std::sync::RwLock;
+use std::sync::{RwLock, TryLockError};
 
 use pyo3::exceptions::PyException;
+use pyo3::pybacked::PyBackedStr;
 use pyo3::types::{PyDict, PyString};
 use pyo3::{create_exception, prelude::*};
 
@@ -9,6 +10,13 @@ use math_core::{CssClassNames, MathCoreConfig, MathDisplay, PrettyPrint};
 create_exception!(_math_core_rust, LatexError, PyException);
 create_exception!(_math_core_rust, LockError, PyException);
 
+/// Inputs up to this length (in bytes) are converted without releasing the GIL, unless the
+/// converter's lock is currently held by another thread. Converting a short input only takes a
+/// few microseconds, so the cost of waiting to reacquire the GIL behind other busy threads would
+/// outweigh the benefit of running in parallel. The exact value is a guess that has not been
+/// benchmarked yet.
+const DETACH_THRESHOLD: usize = 1024;
+
 #[pyclass(frozen)]
 struct LatexToMathML {
     inner: RwLock<math_core::LatexToMathML>,
@@ -121,35 +129,32 @@ impl LatexToMathML {
         displaystyle: bool,
         py: Python<'a>,
     ) -> PyResult<Bound<'a, PyString>> {
-        let display = if displaystyle {
-            MathDisplay::Block
-        } else {
-            MathDisplay::Inline
+        let display = math_display(displaystyle);
+        let convert = || {
+            self.inner
+                .write()
+                .map(|mut inner| inner.convert_with_global_state(latex, display))
+                .map_err(|_| LockError::new_err("Failed to acquire write lock"))
         };
-        match self
-            .inner
-            .write()
-            .map_err(|_| LockError::new_err("Failed to acquire write lock"))?
-            .convert_with_global_state(latex, display)
-        {
-            Err(latex_error) => {
-                if self.continue_on_error {
-                    Ok(PyString::new(
-                        py,
-                        &latex_error.to_html(latex, display, None),
-                    ))
-                } else if self.fancy_error {
-                    Err(LatexError::new_err(render_fancy_error(
-                        &latex_error,
-                        "input",
-                        latex,
-                    )))
-                } else {
-                    let mut err = String::new();
-                    latex_error.to_message(&mut err, latex);
-                    Err(LatexError::new_err(err))
+        // For short inputs, convert without releasing the GIL if the lock is free right away.
+        // Otherwise, wait for the lock without holding the GIL.
+        let short_result = if latex.len() > DETACH_THRESHOLD {
+            None
+        } else {
+            match self.inner.try_write() {
+                Ok(mut inner) => Some(Ok(inner.convert_with_global_state(latex, display))),
+                Err(TryLockError::WouldBlock) => None,
+                Err(TryLockError::Poisoned(_)) => {
+                    Some(Err(LockError::new_err("Failed to acquire write lock")))
                 }
             }
+        };
+        let result = match short_result {
+            Some(result) => result,
+            None => py.detach(convert),
+        }?;
+        match result {
+            Err(latex_error) => self.handle_error(&latex_error, latex, display, py),
             Ok(output) => Ok(PyString::new(py, &output.mathml)),
         }
     }
@@ -162,45 +167,111 @@ impl LatexToMathML {
         displaystyle: bool,
         py: Python<'a>,
     ) -> PyResult<Bound<'a, PyString>> {
-        let display = if displaystyle {
-            MathDisplay::Block
-        } else {
-            MathDisplay::Inline
+        let display = math_display(displaystyle);
+        let convert = || {
+            self.inner
+                .read()
+                .map(|inner| inner.convert_with_local_state(latex, display))
+                .map_err(|_| LockError::new_err("Failed to acquire read lock"))
         };
-        match self
-            .inner
-            .write()
-            .map_err(|_| LockError::new_err("Failed to acquire read lock"))?
-            .convert_with_local_state(latex, display)
-        {
-            Err(latex_error) => {
-                if self.continue_on_error {
-                    Ok(PyString::new(
-                        py,
-                        &latex_error.to_html(latex, display, None),
-                    ))
-                } else if self.fancy_error {
-                    Err(LatexError::new_err(render_fancy_error(
-                        &latex_error,
-                        "input",
-                        latex,
-                    )))
-                } else {
-                    let mut err = String::new();
-                    latex_error.to_message(&mut err, latex);
-                    Err(LatexError::new_err(err))
+        // For short inputs, convert without releasing the GIL if the lock is free right away.
+        // Otherwise, wait for the lock without holding the GIL.
+        let short_result = if latex.len() > DETACH_THRESHOLD {
+            None
+        } else {
+            match self.inner.try_read() {
+                Ok(inner) => Some(Ok(inner.convert_with_local_state(latex, display))),
+                Err(TryLockError::WouldBlock) => None,
+                Err(TryLockError::Poisoned(_)) => {
+                    Some(Err(LockError::new_err("Failed to acquire read lock")))
                 }
             }
+        };
+        let result = match short_result {
+            Some(result) => result,
+            None => py.detach(convert),
+        }?;
+        match result {
+            Err(latex_error) => self.handle_error(&latex_error, latex, display, py),
             Ok(output) => Ok(PyString::new(py, &output.mathml)),
         }
     }
 
-    fn reset_global_state(&self) -> PyResult<()> {
-        self.inner
-            .write()
-            .map_err(|_| LockError::new_err("Failed to acquire write lock"))?
-            .reset_global_state();
-        Ok(())
+    /// Convert a list of LaTeX equations to MathML.
+    ///
+    /// Each item is a tuple of the LaTeX source and the `displaystyle` flag. Uses a fresh equation
+    /// counter, label map and set of `\newcommand` definitions, independent of the converter's
+    /// global state; references to equations in later items are resolved.
+    #[pyo3(signature = (snippets))]
+    fn convert_all<'a>(
+        &self,
+        snippets: Vec<(PyBackedStr, bool)>,
+        py: Python<'a>,
+    ) -> PyResult<Vec<Bound<'a, PyString>>> {
+        let snippets: Vec<(&str, MathDisplay)> = snippets
+            .iter()
+            .map(|(latex, displaystyle)| (&**latex, math_display(*displaystyle)))
+            .collect();
+        let results = py.detach(|| {
+            self.inner
+                .read()
+                .map(|inner| inner.convert_all(&snippets))
+                .map_err(|_| LockError::new_err("Failed to acquire read lock"))
+        })?;
+        results
+            .into_iter()
+            .zip(&snippets)
+            .map(|(result, &(latex, display))| match result {
+                Err(latex_error) => self.handle_error(&latex_error, latex, display, py),
+                Ok(output) => Ok(PyString::new(py, &output.mathml)),
+            })
+            .collect()
+    }
+
+    fn reset_global_state(&self, py: Python<'_>) -> PyResult<()> {
+        // A long conversion may hold the lock, so wait for it without holding the GIL.
+        py.detach(|| {
+            self.inner
+                .write()
+                .map(|mut inner| inner.reset_global_state())
+                .map_err(|_| LockError::new_err("Failed to acquire write lock"))
+        })
+    }
+}
+
+impl LatexToMathML {
+    /// Turn a conversion error into either an HTML snippet or a `LatexError` exception.
+    fn handle_error<'a>(
+        &self,
+        latex_error: &math_core::LatexError,
+        latex: &str,
+        display: MathDisplay,
+        py: Python<'a>,
+    ) -> PyResult<Bound<'a, PyString>> {
+        if self.continue_on_error {
+            Ok(PyString::new(
+                py,
+                &latex_error.to_html(latex, display, None),
+            ))
+        } else if self.fancy_error {
+            Err(LatexError::new_err(render_fancy_error(
+                latex_error,
+                "input",
+                latex,
+            )))
+        } else {
+            let mut err = String::new();
+            latex_error.to_message(&mut err, latex);
+            Err(LatexError::new_err(err))
+        }
+    }
+}
+
+fn math_display(displaystyle: bool) -> MathDisplay {
+    if displaystyle {
+        MathDisplay::Block
+    } else {
+        MathDisplay::Inline
     }
 }
 
@@ -60,6 +60,13 @@ class LatexToMathML:
         """Convert LaTeX to MathML with a global counter for equation numbering."""
     def convert_with_local_state(self, latex: str, *, displaystyle: bool) -> str:
         """Convert LaTeX to MathML with a local counter for equation numbering."""
+    def convert_all(self, snippets: list[tuple[str, bool]]) -> list[str]:
+        r"""Convert a list of ``(latex, displaystyle)`` pairs to MathML in one call.
+
+        Uses a fresh equation counter, label map and set of ``\newcommand`` definitions,
+        independent of the converter's global state; references to equations in later
+        snippets are resolved.
+        """
     def reset_global_state(self) -> None:
         """Reset the global equation counter for environments like ``align``."""
 
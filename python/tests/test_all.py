@@ -74,6 +74,49 @@ def test_global_state():
     assert "(1)" in output
 
 
+def test_convert_all():
+    converter = LatexToMathML()
+    assert converter.convert_all([("x", False), ("y", True)]) == [
+        "<math><mi>x</mi></math>",
+        '<math display="block"><mi>y</mi></math>',
+    ]
+    assert converter.convert_all([]) == []
+
+    converter = LatexToMathML(fancy_error=False)
+    with raises(LatexError, match=r"^0: Unknown command"):
+        _ = converter.convert_all([("x", False), (r"\nonexistentcommand", False)])
+
+
+def test_convert_all_forward_reference():
+    converter = LatexToMathML()
+    output = converter.convert_all(
+        [(r"\eqref{a}", False), (r"\begin{align}x\label{a}\end{align}", True)]
+    )
+    assert output[0] == '<math><mtext><a href="#a">(1)</a></mtext></math>'
+    assert 'id="a"' in output[1]
+    assert "(1)" in output[1]
+
+
+def test_convert_all_continue_on_error():
+    converter = LatexToMathML(continue_on_error=True)
+    output = converter.convert_all([("x", False), (r"\asdf", False)])
+    assert output == [
+        "<math><mi>x</mi></math>",
+        r'<span class="math-core-error" title="0: Unknown command &quot;\asdf&quot;."><code>\asdf</code></span>',
+    ]
+
+
+def test_convert_all_ignores_global_state():
+    converter = LatexToMathML(global_group=True, fancy_error=False)
+    _ = converter.convert_with_global_state(r"\newcommand{\zz}{z}", displaystyle=False)
+    assert (
+        converter.convert_with_global_state(r"\zz", displaystyle=False)
+        == "<math><mi>z</mi></math>"
+    )
+    with raises(LatexError, match=r"^0: Unknown command"):
+        _ = converter.convert_all([(r"\zz", False)])
+
+
 def test_signature():
     assert (
         str(inspect.signature(LatexToMathML.__init__)) == "(self, /, *args, **kwargs)"
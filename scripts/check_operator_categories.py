@@ -10,32 +10,97 @@ Usage:
 
 The spec file is fetched from:
     https://raw.githubusercontent.com/w3c/mathml-core/refs/heads/main/tables/operator-dictionary-compact.html
+
+The spec is cached in ~/.cache/math-core/ (or $XDG_CACHE_HOME) and
+only downloaded again if the server reports that it has changed.
 """
 
+import json
+import os
 import re
 import sys
+from pathlib import Path
 from typing import NamedTuple
+import urllib.error
 import urllib.request
 
 SPEC_URL = "https://raw.githubusercontent.com/w3c/mathml-core/refs/heads/main/tables/operator-dictionary-compact.html"
 SYMBOLS_PATH = "crates/mathml-renderer/src/symbol.rs"
+CACHE_HOME = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+CACHE_DIR = CACHE_HOME / "math-core"
+CACHE_PATH = CACHE_DIR / "operator-dictionary-compact.html"
+CACHE_HEADERS_PATH = CACHE_DIR / "operator-dictionary-compact.json"
+
+# Matches either a range like [U+2190–U+2195] or a single codepoint like U+002B.
+RANGE_PATTERN = re.compile(
+    r"\[U\+([0-9A-F]+)[–-]U\+([0-9A-F]+)\]|(?<!\[)U\+([0-9A-F]+)(?!\s*[–-])"
+)
+
+# Matches definitions like `pub const X: Rel = Rel::new('Y', RelCategory::Z);` that fit
+# on a single line. Anchoring at the start of the line skips commented-out definitions.
+SYMBOL_PATTERN = re.compile(
+    r"^[ \t]*pub const (\w+):[ \t]*(Rel|Bin|Op|OrdLike)[ \t]*=[ \t]*\2::new"
+    r"\('(\\u\{[0-9A-Fa-f]+\}|.)'[ \t]*,[ \t]*(?:Rel|Bin|Op|Ord)Category::(\w+)\)",
+    re.MULTILINE,
+)
 
 
 def fetch_spec() -> str:
     """Fetch the operator dictionary compact HTML from the spec."""
-    with urllib.request.urlopen(SPEC_URL) as resp:
-        return resp.read().decode("utf-8")
+    return fetch_spec_body().decode("utf-8")
+
+
+def fetch_spec_body() -> bytes:
+    """Fetch the raw spec HTML, reusing the cached copy if it is still up to date.
+
+    The response body is cached together with the ``ETag`` and ``Last-Modified``
+    headers, which are sent back on the next run, so that an unchanged spec is not
+    downloaded again.
+    """
+    headers: dict[str, str] = {}
+    if CACHE_PATH.exists() and CACHE_HEADERS_PATH.exists():
+        cached_headers = json.loads(CACHE_HEADERS_PATH.read_text(encoding="utf-8"))
+        if etag := cached_headers.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := cached_headers.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+
+    request = urllib.request.Request(SPEC_URL, headers=headers)
+    try:
+        with urllib.request.urlopen(request) as resp:
+            body = resp.read()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and headers:
+            return CACHE_PATH.read_bytes()
+        raise
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Remove the old headers first and write the new ones last, so that the headers
+    # on disk always belong to the cached body, even if the script is interrupted.
+    CACHE_HEADERS_PATH.unlink(missing_ok=True)
+    write_atomically(CACHE_PATH, body)
+    headers_json = json.dumps({"etag": etag, "last_modified": last_modified})
+    write_atomically(CACHE_HEADERS_PATH, headers_json.encode("utf-8"))
+    return body
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    """Write to a temporary file and move it into place."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
 
 
 def parse_ranges(text: str) -> set[int]:
     """Parse Unicode ranges like [U+2190–U+2195] and {U+002B} into a set of codepoints."""
     codepoints: set[int] = set()
-    for m in re.finditer(r"\[U\+([0-9A-F]+)[–-]U\+([0-9A-F]+)\]", text):
-        start, end = int(m.group(1), 16), int(m.group(2), 16)
-        for cp in range(start, end + 1):
-            codepoints.add(cp)
-    for m in re.finditer(r"(?<!\[)U\+([0-9A-F]+)(?!\s*[–-])", text):
-        codepoints.add(int(m.group(1), 16))
+    for m in RANGE_PATTERN.finditer(text):
+        if m.group(1) is not None:
+            codepoints.update(range(int(m.group(1), 16), int(m.group(2), 16) + 1))
+        else:
+            codepoints.add(int(m.group(3), 16))
     return codepoints
 
 
@@ -72,49 +137,10 @@ def parse_symbol_rs(path: str) -> list[tuple[str, int, str, str]]:
     with open(path) as f:
         content = f.read()
 
-    symbols: list[tuple[str, int, str, str]] = []
-    for line in content.split("\n"):
-        stripped = line.strip()
-        if stripped.startswith("//"):
-            continue
-
-        # Match Rel::new('X', RelCategory::Y)
-        m = re.search(
-            r"pub const (\w+):\s*Rel\s*=\s*Rel::new\('(\\u\{[0-9A-Fa-f]+\}|.)'\s*,\s*RelCategory::(\w+)\)",
-            line,
-        )
-        if m:
-            symbols.append((m.group(1), _parse_char(m.group(2)), "Rel", m.group(3)))
-            continue
-
-        # Match Bin::new('X', BinCategory::Y)
-        m = re.search(
-            r"pub const (\w+):\s*Bin\s*=\s*Bin::new\('(\\u\{[0-9A-Fa-f]+\}|.)'\s*,\s*BinCategory::(\w+)\)",
-            line,
-        )
-        if m:
-            symbols.append((m.group(1), _parse_char(m.group(2)), "Bin", m.group(3)))
-            continue
-
-        # Match Op::new('X', OpCategory::Y)
-        m = re.search(
-            r"pub const (\w+):\s*Op\s*=\s*Op::new\('(\\u\{[0-9A-Fa-f]+\}|.)'\s*,\s*OpCategory::(\w+)\)",
-            line,
-        )
-        if m:
-            symbols.append((m.group(1), _parse_char(m.group(2)), "Op", m.group(3)))
-            continue
-
-        # Match OrdLike::new('X', OrdCategory::Y)
-        m = re.search(
-            r"pub const (\w+):\s*OrdLike\s*=\s*OrdLike::new\('(\\u\{[0-9A-Fa-f]+\}|.)'\s*,\s*OrdCategory::(\w+)\)",
-            line,
-        )
-        if m:
-            symbols.append((m.group(1), _parse_char(m.group(2)), "OrdLike", m.group(3)))
-            continue
-
-    return symbols
+    return [
+        (m.group(1), _parse_char(m.group(3)), m.group(2), m.group(4))
+        for m in SYMBOL_PATTERN.finditer(content)
+    ]
 
 
 def _parse_char(s: str) -> int:
@@ -124,6 +150,20 @@ def _parse_char(s: str) -> int:
     return ord(s)
 
 
+# Category of characters which are not listed in the spec.
+DEFAULT_CATEGORIES = frozenset({"Default"})
+
+# Symbols whose category deliberately differs from the spec.
+ALLOWED_DEVIATIONS = frozenset(
+    {
+        ("SOLIDUS", "KButUsedToBeB"),
+        ("VERTICAL_LINE", "FGandForceDefault"),
+        ("DOUBLE_VERTICAL_LINE", "FGandForceDefault"),
+        ("TILDE_OPERATOR", "DandForceDefault"),
+    }
+)
+
+
 class Mismatch(NamedTuple):
     name: str
     char_repr: str
@@ -139,30 +179,22 @@ def compare(
     mismatches: list[Mismatch] = []
 
     for name, cp, typ, cat in symbols:
-        spec_cats = spec.get(cp, {"Default"})
-        char_repr = chr(cp)
-        cp_str = f"U+{cp:04X}"
-
-        if name == "SOLIDUS" and cat == "KButUsedToBeB":
-            continue
-        if (
-            name in {"VERTICAL_LINE", "DOUBLE_VERTICAL_LINE"}
-            and cat == "FGandForceDefault"
-        ):
-            continue
-        if name == "TILDE_OPERATOR" and cat == "DandForceDefault":
+        if (name, cat) in ALLOWED_DEVIATIONS:
             continue
 
-        if len(cat) == 2:
-            found_cats = set(cat)
-        else:
-            found_cats = {cat}
+        spec_cats = spec.get(cp, DEFAULT_CATEGORIES)
+        found_cats = set(cat) if len(cat) == 2 else {cat}
 
         if found_cats != spec_cats:
             mismatches.append(
-                Mismatch(name, char_repr, cp_str, f"{typ}::{cat}", f"spec: {spec_cats}")
+                Mismatch(
+                    name,
+                    chr(cp),
+                    f"U+{cp:04X}",
+                    f"{typ}::{cat}",
+                    f"spec: {set(spec_cats)}",
+                )
             )
-        continue
     return mismatches
 
 
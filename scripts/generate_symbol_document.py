@@ -6,6 +6,8 @@ UNICODE_PATTERN = re.compile(
     r"^pub const [^:]+: \S+ =[^']+'\\u\{([0-9A-Fa-f]+)\}'[^;]*;", re.MULTILINE
 )
 DOTTED_CIRCLE = "◌"
+# Unassigned, surrogate, and private use characters
+EXCLUDED_CATEGORIES = frozenset(("Cn", "Cs", "Co"))
 SYMBOLS_PATH = "crates/mathml-renderer/src/symbol.rs"
 PLAYGROUND_PATH = "playground/index.html"
 OUTPUT_PATH = "scripts/all_symbols.txt"
@@ -24,8 +26,11 @@ def extract_symbols() -> str:
 
 
 def is_valid_unicode(char: str) -> bool:
-    # Exclude unassigned, surrogate, and private use characters
-    return ud.category(char) not in ("Cn", "Cs", "Co")
+    return ud.category(char) not in EXCLUDED_CATEGORIES
+
+
+def valid_chars(code_range: range) -> str:
+    return "".join(filter(is_valid_unicode, map(chr, code_range)))
 
 
 def common_unicode_blocks() -> list[str]:
@@ -56,10 +61,7 @@ def common_unicode_blocks() -> list[str]:
     code_points.append(range(0x2028, 0x2030))
     # General Punctuation: invisible markers
     code_points.append(range(0x205F, 0x2070))
-    return [
-        "".join(ch for cp in code_range if is_valid_unicode(ch := chr(cp)))
-        for code_range in code_points
-    ]
+    return [valid_chars(code_range) for code_range in code_points]
 
 
 def math_script_blocks() -> list[str]:
@@ -119,10 +121,7 @@ def math_script_blocks() -> list[str]:
     code_points.append(range(0x1D756, 0x1D790))
     # Bold sans-serif (digits)
     code_points.append(range(0x1D7EC, 0x1D7F6))
-    lines = [
-        "".join(ch for cp in code_range if is_valid_unicode(ch := chr(cp)))
-        for code_range in code_points
-    ]
+    lines = [valid_chars(code_range) for code_range in code_points]
     lines.append(stragglers)
     return lines
 
@@ -132,9 +131,7 @@ def unicode_variants() -> str:
     variant1 = "\ufe01"
     script_chars: list[str] = []
     # Script
-    script_chars.extend(
-        ch for cp in range(0x1D49C, 0x1D4D0) if is_valid_unicode(ch := chr(cp))
-    )
+    script_chars.extend(valid_chars(range(0x1D49C, 0x1D4D0)))
     # Script from other blocks
     script_chars += list("ℬℰℱℋℐℒℳℛℯℊℴ")
     line = "".join(f"{ch}{variant0}" for ch in script_chars)